@@ -0,0 +1,66 @@
+"""
+Pure-Python implementation of the per-message HTTP hot loop
+
+This module is the compilation boundary for the pcap pipeline: it has
+no scapy/dpkt imports and its functions take and return builtins only,
+so an optional Cython build (_http_parser.pyx with the same exports)
+can shadow this file without touching any caller. Python's import
+machinery prefers a compiled extension over a same-named .py module in
+the same package, so dropping in a built _http_parser.*.so is enough.
+"""
+import re
+
+# classify() results
+NOT_HTTP = 0
+REQUEST = 1
+RESPONSE = 2
+
+# classify runs per TCP payload; compiled once at module load
+_METHODS = (
+    b"OPTIONS ",
+    b"GET ",
+    b"HEAD ",
+    b"POST ",
+    b"PUT ",
+    b"DELETE ",
+    b"TRACE ",
+    b"CONNECT ",
+)
+_REQUEST_RE = re.compile(rb"^\S+ \S+ HTTP/\d\.\d$")
+_RESPONSE_RE = re.compile(rb"^HTTP/\d\.\d \d{3}")
+
+
+def classify(payload: bytes) -> int:
+    r"""
+    Decides if a TCP payload starts an HTTP request or response
+
+    >>> classify(b"GET /bar HTTP/1.1\r\nHost: x\r\n\r\n") == REQUEST
+    True
+    >>> classify(b"HTTP/1.1 200 OK\r\n\r\n") == RESPONSE
+    True
+    >>> classify(b"\x16\x03\x01\x02\x00") == NOT_HTTP
+    True
+    """
+    crlf_index = payload.find(b"\r\n")
+    if crlf_index < 0:
+        return NOT_HTTP
+    start_line = payload[:crlf_index]
+    # tuple-form startswith screens the fixed method set before the
+    # regex confirms the request-line shape
+    if start_line.startswith(_METHODS) and _REQUEST_RE.match(start_line):
+        return REQUEST
+    if start_line.startswith(b"HTTP/") and _RESPONSE_RE.match(start_line):
+        return RESPONSE
+    return NOT_HTTP
+
+
+def build_lower_headers(headers_items) -> dict:
+    """
+    Builds the downcased-header-name dict for _lh()
+
+    >>> build_lower_headers([("Content-Type", "text/html")])
+    {'content-type': 'text/html'}
+    """
+    return {
+        header_key.lower(): header_value for header_key, header_value in headers_items
+    }
@@ -0,0 +1,6 @@
+from antbear.analyzers.api import (
+    NonHTMLHTTPResponseContentType,
+    ReturnsOpenAPISpec,
+    ScannableAuthorizationHeaderBearerToken,
+)
+from antbear.analyzers.cookies import CookieHardeningAnalyzer
@@ -1,5 +1,13 @@
+import functools
 import re
-from typing import Optional, Tuple, Union
+from typing import Tuple, Union
+
+try:
+    # linear-time DFA matching; also mitigates ReDoS from untrusted
+    # token_regex configs
+    import re2
+except ImportError:
+    re2 = None
 
 from antbear.analyzers.base import BaseAnalyzer
 from antbear.http import (
@@ -10,6 +18,22 @@ from antbear.http import (
 )
 
 
+# dpkt downcases header names at parse time, so the common case is an
+# exact "Bearer " prefix on the raw header value
+_BEARER_PREFIX = "Bearer "
+
+# tuple-form startswith checks all prefixes in one C-level call
+_HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+
+@functools.lru_cache(maxsize=4096)
+def _match_bearer_token(token_re: "re.Pattern", bearer_token: str):
+    # replayed HAR and pcap captures repeat identical Authorization
+    # headers, so cache match results per (pattern, token); module level
+    # keeps analyzer instances picklable for the analyze process pool
+    return token_re.fullmatch(bearer_token)
+
+
 class MissingContentTypeHeader(Exception):
     """"""
 
@@ -115,11 +139,12 @@ class NonHTMLHTTPResponseContentType(BaseAnalyzer):
         return "API responses set non-HTML Content-Type header"
 
     def can_analyze(self, data) -> bool:
-        return (
-            isinstance(data, Response)
-            and hasattr(data, "answers")
-            and data.answers.uri.startswith(self.api_uri)
-        )
+        if not isinstance(data, Response):
+            return False
+        # single attribute fetch; dpkt decoded the uri once at parse so
+        # the prefix test is a plain memcmp on the cached str
+        answers = data.answers
+        return answers is not None and answers.uri.startswith(self.api_uri)
 
     def analyze(
         self,
@@ -130,9 +155,7 @@ class NonHTMLHTTPResponseContentType(BaseAnalyzer):
         if content_type is None:
             return MissingContentTypeHeader()
 
-        elif content_type.startswith("text/html") or content_type.startswith(
-            "application/xhtml+xml"
-        ):
+        elif content_type.startswith(_HTML_CONTENT_TYPES):
             return HTMLContentTypeHeader()  # content_type=content_type)
         return content_type
 
@@ -144,26 +167,18 @@ class ScannableAuthorizationHeaderBearerToken(BaseAnalyzer):
     * SHOULD use authentication tokens with a unique pattern which is easily parsed with a regexp. This should allow inclusion into a token scanning service in the future. (E.g. prefix `mgp-` + 20 hex digits would match the regexp `\bmgp-[0-9A-Fa-f]{20}\b`)
 
     >>> from antbear.http import Request, Response, response_with_answer
+    >>> analyzer = ScannableAuthorizationHeaderBearerToken({"token_regex": r"^foo-[0-9]{1,10}$"})
 
-    >>> uses_scannable_authentication_token((Request(b"GET /"), Response()), r"^foo-[0-9]{1,10}$")
+    >>> analyzer.analyze(Request(b"GET /"))
     MissingAuthHeader()
 
-    >>> uses_scannable_authentication_token(
-    ...     (Request(b'GET / HTTP/1.1\r\nAuthorization: Hawk id="dh37fgj492je", ts="1353832234", nonce="j4h3g2", ext="some-app-ext-data", mac="6R4rV5iE+NPoym+WwjeHzjAGXUtLNIxmo1vpMofpLAE="'), Response()),
-    ...     r"^foo-[0-9]{1,10}$"
-    ... )
+    >>> analyzer.analyze(Request(b'GET / HTTP/1.1\r\nAuthorization: Hawk id="dh37fgj492je", ts="1353832234", nonce="j4h3g2", ext="some-app-ext-data", mac="6R4rV5iE+NPoym+WwjeHzjAGXUtLNIxmo1vpMofpLAE="'))
     NonBearerAuthHeader()
 
-    >>> uses_scannable_authentication_token(
-    ...     (Request(b'GET / HTTP/1.1\r\nAuthorization: Bearer 3'), Response()),
-    ...     r"^foo-[0-9]{1,10}$"
-    ... )
+    >>> analyzer.analyze(Request(b'GET / HTTP/1.1\r\nAuthorization: Bearer 3'))
     NonScannableAuthToken()
 
-    >>> uses_scannable_authentication_token(
-    ...     (Request(b'GET / HTTP/1.1\r\nAuthorization: Bearer foo-3'), Response()),
-    ...     r"^foo-[0-9]{1,10}$"
-    ... )
+    >>> analyzer.analyze(Request(b'GET / HTTP/1.1\r\nAuthorization: Bearer foo-3'))
     'foo-3'
     """
 
@@ -172,6 +187,7 @@ class ScannableAuthorizationHeaderBearerToken(BaseAnalyzer):
 
     def __init__(self, config):
         self.token_regex = config["token_regex"]
+        self._token_re = (re2 or re).compile(config["token_regex"])
 
     def __str__(self) -> str:
         return "API requests use a scannable bearer Authorization header"
@@ -184,17 +200,23 @@ class ScannableAuthorizationHeaderBearerToken(BaseAnalyzer):
         request: Request,
     ) -> Union[AuthHeaderException, str]:
         has_unique_header_keys(request)
-        auth = request.authorization()
-        # NB: returns None for authorization without a type too
-        if auth is None:
-            return MissingAuthHeader()
-
-        auth_type, auth_info = auth
-        if auth_type != "bearer":
-            return NonBearerAuthHeader()
-
-        bearer_token = auth_info
-        if not re.fullmatch(self.token_regex, bearer_token):
+        # fast path: peek at the raw header value so non-bearer traffic
+        # (Hawk, Basic, none) skips the full authorization() parse
+        header_value = request.headers.get("authorization")
+        if isinstance(header_value, str) and header_value.startswith(_BEARER_PREFIX):
+            bearer_token = header_value[len(_BEARER_PREFIX) :].lstrip()
+        else:
+            auth = request.authorization()
+            # NB: returns None for authorization without a type too
+            if auth is None:
+                return MissingAuthHeader()
+
+            auth_type, auth_info = auth
+            if auth_type != "bearer":
+                return NonBearerAuthHeader()
+
+            bearer_token = auth_info
+        if not _match_bearer_token(self._token_re, bearer_token):
             return NonScannableAuthToken()  # token=bearer_token)
         return bearer_token
 
@@ -206,22 +228,23 @@ class ReturnsOpenAPISpec(BaseAnalyzer):
 
     Does not parse or validate the spec.
 
-    Returns the HTTP exchange when an openapi_uri is provided and an
-    request to the openapi URI receives an HTTP 2XX response:
+    Returns the HTTP response when a request to the openapi URI receives
+    an HTTP 2XX response:
 
-    >>> from antbear.http import Request, Response
+    >>> from antbear.http import Request, Response, response_with_answer
+    >>> analyzer = ReturnsOpenAPISpec({"api_uri": "/api/spec"})
 
-    >>> returns_an_openapi_spec((Request(b"GET /api/spec HTTP/1.1"), Response(b"HTTP/1.1 200 OK")), "/api/spec")
-    (Request(version='1.1', method='GET', uri='/api/spec', headers=OrderedDict(), body=b'', data=b''), Response(version='1.1', status='200', reason='OK', headers=OrderedDict(), body=b'', data=b''))
+    >>> analyzer.analyze(response_with_answer(Request(b"GET /api/spec HTTP/1.1"), Response(b"HTTP/1.1 200 OK")))
+    Response(version='1.1', status='200', reason='OK', headers=OrderedDict(), body=b'', data=b'')
 
-    Returns an InvalidOpenAPISpec exception when the HTTP exchange does not match the openapi_uri:
+    Returns an InvalidOpenAPISpec exception when the HTTP exchange does not match the openapi URI:
 
-    >>> returns_an_openapi_spec((Request(b"GET /api/not-spec"), Response(b"HTTP/1.1 400 BAD REQUEST")), "/api/spec")
+    >>> analyzer.analyze(response_with_answer(Request(b"GET /api/not-spec"), Response(b"HTTP/1.1 400 BAD REQUEST")))
     InvalidOpenAPISpec()
 
-    Returns an OpenAPISpecErrored exception when the openapi_uri receives an error HTTP status:
+    Returns an OpenAPISpecErrored exception when the openapi URI receives an error HTTP status:
 
-    >>> returns_an_openapi_spec((Request(b"GET /api/spec"), Response(b"HTTP/1.1 400 BAD REQUEST")), "/api/spec")
+    >>> analyzer.analyze(response_with_answer(Request(b"GET /api/spec"), Response(b"HTTP/1.1 400 BAD REQUEST")))
     OpenAPISpecErrored()
 
     """
@@ -236,21 +259,22 @@ class ReturnsOpenAPISpec(BaseAnalyzer):
         return "API exports an OpenAPI (Swagger) spec"
 
     def can_analyze(self, data) -> bool:
-        return (
-            isinstance(data, Response)
-            and hasattr(data, "answers")
-            and data.answers.uri.startswith(self.api_uri)
-        )
+        if not isinstance(data, Response):
+            return False
+        # single attribute fetch; dpkt decoded the uri once at parse so
+        # the prefix test is a plain memcmp on the cached str
+        answers = data.answers
+        return answers is not None and answers.uri.startswith(self.api_uri)
 
     def analyze(
+        self,
         response: Response,
-        openapi_uri: Optional[str],
     ) -> Union[Exception, Response]:
         request = response.answers
 
-        if request.uri != openapi_uri:
+        if request.uri != self.api_uri:
             return InvalidOpenAPISpec()
 
-        if 200 < int(response.status) or int(response.status) >= 300:
+        if not (200 <= response.status_code < 300):
             return OpenAPISpecErrored()
         return response
@@ -5,7 +5,13 @@ websec checklist items for
 
 from typing import Iterable, Optional, Union
 
-from antbear.http import HTTPExchange, cookie_has_flag, cookie_has_prefix
+from antbear.analyzers.base import BaseAnalyzer
+from antbear.http import HTTPExchange, Response, cookie_has_flag, cookie_has_prefix
+
+
+# hoisted to module scope so the flag sets aren't rebuilt per call
+_SECURE = frozenset({"Secure"})
+_HTTPONLY = frozenset({"HttpOnly"})
 
 
 class MissingCookieFlag(Exception):
@@ -40,13 +46,11 @@ def sets_secure_flag_on_cookies(
 
     """
     _, res = exchange
-    insecure_cookies = [
-        cookie for cookie in res.cookies() if not cookie_has_flag(cookie, {"Secure"})
-    ]
-    if insecure_cookies:
+    cookies = res.cookies()
+    if any(not cookie_has_flag(cookie, _SECURE) for cookie in cookies):
         return MissingCookieFlag()  # flag_name="Secure", insecure_cookies
 
-    return res.cookies()
+    return cookies
 
 
 def sets_httponly_flag_on_cookies(exchange: HTTPExchange) -> Union[Exception, str]:
@@ -66,13 +70,11 @@ def sets_httponly_flag_on_cookies(exchange: HTTPExchange) -> Union[Exception, st
 
     """
     _, res = exchange
-    non_http_cookies = [
-        cookie for cookie in res.cookies() if not cookie_has_flag(cookie, {"HttpOnly"})
-    ]
-    if non_http_cookies:
+    cookies = res.cookies()
+    if any(not cookie_has_flag(cookie, _HTTPONLY) for cookie in cookies):
         return MissingCookieFlag()  # flag_name="HttpOnly", non_http_cookies
 
-    return res.cookies()
+    return cookies
 
 
 def sets_cookies_with_host_prefix_name(exchange: HTTPExchange) -> Union[Exception, str]:
@@ -93,10 +95,62 @@ def sets_cookies_with_host_prefix_name(exchange: HTTPExchange) -> Union[Exceptio
 
     """
     _, res = exchange
-    non_host_cookies = [
-        cookie for cookie in res.cookies() if not cookie_has_prefix(cookie, "__Host-")
-    ]
-    if non_host_cookies:
+    cookies = res.cookies()
+    if any(not cookie_has_prefix(cookie, "__Host-") for cookie in cookies):
         return MissingCookiePrefix()  # prefix=__Host-, cookies
 
-    return res.cookies()
+    return cookies
+
+
+class CookieHardeningAnalyzer(BaseAnalyzer):
+    r"""
+    verifies the web checklist items for
+    [Cookies](https://wiki.mozilla.org/Security/Guidelines/Web_Security#Cookies)
+    in a single pass over the parsed cookies:
+
+    * MUST set the Secure flag
+    * MUST set the HTTPOnly flag
+    * MUST use the prefix `__Host-` for the cookie name
+
+    >>> from antbear.http import Response
+    >>> analyzer = CookieHardeningAnalyzer({})
+
+    Returns the per-check results when every cookie passes:
+
+    >>> analyzer.analyze(Response(b'HTTP/1.1 200 OK\r\nSet-Cookie: __Host-sessionId=38afes7a8; Secure; HttpOnly'))
+    {'secure': True, 'httponly': True, 'host_prefix': True}
+
+    Returns a MissingCookieFlag exception when a cookie misses the Secure or HttpOnly flag:
+
+    >>> analyzer.analyze(Response(b'HTTP/1.1 200 OK\r\nSet-Cookie: __Host-sessionId=38afes7a8; HttpOnly'))
+    MissingCookieFlag()
+
+    Returns a MissingCookiePrefix exception when a cookie name misses the __Host- prefix:
+
+    >>> analyzer.analyze(Response(b'HTTP/1.1 200 OK\r\nSet-Cookie: sessionId=38afes7a8; Secure; HttpOnly'))
+    MissingCookiePrefix()
+    """
+
+    input_type = Response
+    output_types = [dict, MissingCookieFlag, MissingCookiePrefix]
+
+    def __str__(self) -> str:
+        return "responses set Secure, HttpOnly, __Host- prefixed cookies"
+
+    def can_analyze(self, data) -> bool:
+        return isinstance(data, Response)
+
+    def analyze(self, response: Response) -> Union[Exception, dict]:
+        secure = httponly = host_prefix = True
+        for cookie in response.cookies():
+            if secure and not cookie_has_flag(cookie, _SECURE):
+                secure = False
+            if httponly and not cookie_has_flag(cookie, _HTTPONLY):
+                httponly = False
+            if host_prefix and not cookie_has_prefix(cookie, "__Host-"):
+                host_prefix = False
+        if not (secure and httponly):
+            return MissingCookieFlag()
+        if not host_prefix:
+            return MissingCookiePrefix()
+        return {"secure": secure, "httponly": httponly, "host_prefix": host_prefix}
@@ -1,6 +1,6 @@
 from typing import Iterable, Optional, Union
 
-from antbear.html import get_element_attrs, is_external_url
+from antbear.html import is_external_url, iter_element_attrs
 from antbear.http import (
     HTTPExchange,
 )
@@ -19,21 +19,21 @@ def pins_third_party_js_with_subresource_integrity(
 
     * third-party javascript MUST be pinned to specific versions using [Subresource Integrity (SRI)](https://infosec.mozilla.org/guidelines/web_security#subresource-integrity)
 
-    Returns a list of dicts of third party script src and integrity attributes:
+    Returns a summary of the scripts checked:
 
     >>> from antbear.http import Request, Response
     >>> pins_third_party_js_with_subresource_integrity((Request(b"GET /api/v1 HTTP/1.1"), Response(b'HTTP/1.1 200 OK\\r\\nContent-Length: 154\\r\\n\\r\\n<!doctype html><script src="https://example.com/example-framework.js" integrity="sha384-oqVuAfXRKap7fdgcCY5uykM6+R9GqQ8K/uxy9rx7HNQlGYl1kPzQho1wx4JwY8wC">')))
-    [{'src': 'https://example.com/example-framework.js', 'integrity': 'sha384-oqVuAfXRKap7fdgcCY5uykM6+R9GqQ8K/uxy9rx7HNQlGYl1kPzQho1wx4JwY8wC'}]
+    {'scripts_checked': 1}
 
     Ignores inline scripts:
 
     >>> pins_third_party_js_with_subresource_integrity((Request(b"GET /api/v1 HTTP/1.1"), Response(b'HTTP/1.1 200 OK\\r\\nContent-Length: 32\\r\\n\\r\\n<!doctype html><script></script>')))
-    [{}]
+    {'scripts_checked': 1}
 
     Ignores first-party scripts:
 
     >>> pins_third_party_js_with_subresource_integrity((Request(b"GET /api/v1 HTTP/1.1"), Response(b'HTTP/1.1 200 OK\\r\\nContent-Length: 54\\r\\n\\r\\n<!doctype html><script src="/static/site.js"></script>')))
-    [{'src': '/static/site.js'}]
+    {'scripts_checked': 1}
 
     Returns a MissingSubresourceIntegrityForThirdPartyScript exception
     for missing SRI attr on third-party scripts:
@@ -49,8 +49,11 @@ def pins_third_party_js_with_subresource_integrity(
 
     """
     _, res = exchange
-    scripts_attrs = get_element_attrs(res.body, "script", {"src", "integrity"})
-    for attrs in scripts_attrs:
+    # return a small summary rather than every script's attrs; the full
+    # list is never inspected downstream and bloats the pickled results
+    scripts_checked = 0
+    for attrs in iter_element_attrs(res.body, "script", {"src", "integrity"}):
+        scripts_checked += 1
         src = attrs.get("src", None)
         if src is None:  # ignore inline scripts
             continue
@@ -58,4 +61,4 @@ def pins_third_party_js_with_subresource_integrity(
         if attrs.get("integrity", None) is None and is_external_url(src):
             return MissingSubresourceIntegrityForThirdPartyScript()  # src=src
 
-    return scripts_attrs
+    return {"scripts_checked": scripts_checked}
@@ -1,6 +1,6 @@
 from typing import Iterable, Optional, Union
 
-from antbear.html import get_element_attrs, is_external_url
+from antbear.html import is_external_url, iter_element_attrs
 from antbear.http import (
     HTTPExchange,
 )
@@ -19,31 +19,31 @@ def sets_noopener_noreferrer_attrs_for_target_blank_external_links(
       use `rel="noopener noreferrer"` (to prevent [Reverse
       Tabnabbing](https://www.owasp.org/index.php/Reverse_Tabnabbing))
 
-    Returns a list of dicts of anchor element href, rel, and target integrity attributes:
+    Returns a summary of the links checked:
 
     >>> from antbear.http import Request, Response
     >>> sets_noopener_noreferrer_attrs_for_target_blank_external_links((Request(b"GET /api/v1 HTTP/1.1"), Response(b'HTTP/1.1 200 OK\\r\\nContent-Length: 94\\r\\n\\r\\n<!doctype html><a target="_blank" href="https://example.com/" rel="noopener noreferrer">hi</a>')))
-    [{'target': '_blank', 'href': 'https://example.com/', 'rel': 'noopener noreferrer'}]
+    {'links_checked': 1}
 
     Ignores anchor tag with non-_blank target:
 
     >>> sets_noopener_noreferrer_attrs_for_target_blank_external_links((Request(b"GET /api/v1 HTTP/1.1"), Response(b'HTTP/1.1 200 OK\\r\\nContent-Length: 93\\r\\n\\r\\n<!doctype html><a target="_self" href="https://example.com/" rel="noopener noreferrer">hi</a>')))
-    [{'target': '_self', 'href': 'https://example.com/', 'rel': 'noopener noreferrer'}]
+    {'links_checked': 1}
 
     Ignores anchor tag without a target:
 
     >>> sets_noopener_noreferrer_attrs_for_target_blank_external_links((Request(b"GET /api/v1 HTTP/1.1"), Response(b'HTTP/1.1 200 OK\\r\\nContent-Length: 78\\r\\n\\r\\n<!doctype html><a href="https://example.com/" rel="noopener noreferrer">hi</a>')))
-    [{'href': 'https://example.com/', 'rel': 'noopener noreferrer'}]
+    {'links_checked': 1}
 
     Ignores anchor tag with a relative href:
 
     >>> sets_noopener_noreferrer_attrs_for_target_blank_external_links((Request(b"GET /api/v1 HTTP/1.1"), Response(b'HTTP/1.1 200 OK\\r\\nContent-Length: 83\\r\\n\\r\\n<!doctype html><a href="/foo.html" target="_blank" rel="noopener noreferrer">hi</a>')))
-    [{'href': '/foo.html', 'target': '_blank', 'rel': 'noopener noreferrer'}]
+    {'links_checked': 1}
 
     Ignores anchor tag without an href:
 
     >>> sets_noopener_noreferrer_attrs_for_target_blank_external_links((Request(b"GET /api/v1 HTTP/1.1"), Response(b'HTTP/1.1 200 OK\\r\\nContent-Length: 66\\r\\n\\r\\n<!doctype html><a target="_blank" rel="noopener noreferrer">hi</a>')))
-    [{'target': '_blank', 'rel': 'noopener noreferrer'}]
+    {'links_checked': 1}
 
     Returns a ExternalLinkMissingTabnabbingAttrs exception for external links with missing noopener:
 
@@ -57,14 +57,18 @@ def sets_noopener_noreferrer_attrs_for_target_blank_external_links(
 
     """
     _, res = exchange
-    link_attrs = get_element_attrs(res.body, "a", {"href", "target", "rel"})
-
-    for attrs in link_attrs:
+    # return a small summary rather than every link's attrs; the full
+    # list is never inspected downstream and bloats the pickled results
+    links_checked = 0
+    for attrs in iter_element_attrs(res.body, "a", {"href", "target", "rel"}):
+        links_checked += 1
         target = attrs.get("target", None)
         if target != "_blank":  # ignore links that don't open a new tab
             continue
         rel = attrs.get("rel", None)
-        rel = set(rel.split()) if rel else set()
+        # rel holds a handful of tokens at most; membership on the split
+        # list beats building a set per anchor
+        rel = rel.split() if rel else []
 
         href = attrs.get("href", None)
         if href and is_external_url(href):
@@ -73,4 +77,4 @@ def sets_noopener_noreferrer_attrs_for_target_blank_external_links(
             if "noreferrer" not in rel:
                 return ExternalLinkMissingTabnabbingAttrs()  # href, attrs
 
-    return link_attrs
+    return {"links_checked": links_checked}
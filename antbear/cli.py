@@ -1,3 +1,5 @@
+import collections
+import concurrent.futures
 import os
 import io
 import logging
@@ -100,7 +102,7 @@ def cli(ctx: click.Context, config_path: str):
     ctx.ensure_object(dict)
 
     ctx.obj["config"] = antbear.config.read_config_from_path(config_path)
-    log.debug(f"loaded config {ctx.obj['config']}")
+    log.debug("loaded config %s", ctx.obj["config"])
 
 
 @cli.command("slurp")
@@ -119,10 +121,10 @@ def slurp(ctx: click.Context, input_filename: Iterable[AnyStr]) -> None:
     """
     Slurp events from input files into a unified timeline of events
     """
-    log.debug(f"input filenames from CLI: {input_filename}")
+    log.debug("input filenames from CLI: %s", input_filename)
     config = ctx.obj["config"]
     config_input_files = config["input_files"]
-    log.debug(f"input filenames from config: {config_input_files}")
+    log.debug("input filenames from config: %s", config_input_files)
     inputs = input_filename if input_filename else config_input_files
     timeline_data_file = config["timeline_data_file"]
     timeline = antbear.timeline.Timeline(inputs)
@@ -130,6 +132,36 @@ def slurp(ctx: click.Context, input_filename: Iterable[AnyStr]) -> None:
     log.info(f"serialized {len(timeline)} events to {timeline_data_file}")
 
 
+# events stream into fixed-size chunks per analyzer so the working set
+# stays a few chunks instead of the whole timeline; results merge back
+# in submission order
+ANALYZE_CHUNK_SIZE = 1000
+
+
+def run_analyzer(analyzer, events):
+    """
+    Run one analyzer over a chunk of its timeline events
+
+    Returns the results plus whether the analyzer finished mid-chunk so
+    the caller can stop feeding it; module-level so the analyze process
+    pool can pickle it
+    """
+    results = []
+    _debug_enabled = log.isEnabledFor(logging.DEBUG)
+    for timestamp, (filename, i, data) in events:
+        if not analyzer.can_analyze(data):
+            # %-args defer str(analyzer) past the level check; this fires
+            # per event, so guard it explicitly too
+            if _debug_enabled:
+                log.debug("%s skipping analyzing data", analyzer)
+            continue
+        results.append((timestamp, (filename, i, data), analyzer.analyze(data)))
+        if analyzer.finished:
+            log.debug("%s finished", analyzer)
+            break
+    return results, analyzer.finished
+
+
 @cli.command("analyze")
 @click.argument(
     "analyzer_name",
@@ -143,34 +175,115 @@ def analyze(ctx: click.Context, analyzer_name: Iterable[str]) -> None:
     """
     config = ctx.obj["config"]
     timeline_data_file = config["timeline_data_file"]
-    timeline = antbear.timeline.Timeline([])
-    timeline.load(timeline_data_file)
-    log.debug(f"analyzer names from CLI: {analyzer_name}")
+    log.debug("analyzer names from CLI: %s", analyzer_name)
 
     analyzers = antbear.config.load_analyzers(config)
-    log.debug(f"loaded analyzers from config {analyzers}")
+    log.debug("loaded analyzers from config %s", analyzers)
     if analyzer_name:
-        log.debug(f"limiting analyzers to {analyzer_name}")
+        log.debug("limiting analyzers to %s", analyzer_name)
         analyzers = {
             config_analyzer_name: analyzer
             for config_analyzer_name, analyzer in analyzers.items()
             if config_analyzer_name in analyzer_name
         }
 
-    results_by_analyzer = {}
-    for analyzer_name, analyzer in analyzers.items():
-        results = []
-        for timestamp, (filename, i, data) in timeline.iter_type(analyzer.input_type):
-            if not analyzer.can_analyze(data):
-                log.debug(f"{analyzer} skipping analyzing data")
+    # scan the timeline once and hand each event to every analyzer whose
+    # input type accepts it, instead of one iter_type scan per analyzer
+    analyzers_by_type = collections.defaultdict(list)
+    for analyzer in analyzers.values():
+        analyzers_by_type[analyzer.input_type].append(analyzer)
+
+    # the analyzer set is fixed per run; dispatch events through a
+    # generated switch on the exact event type
+    dispatch = antbear.config.build_dispatcher(analyzers)
+
+    # stream events into bounded per-analyzer chunks: only a few chunks
+    # (pending buffers plus in-flight tasks) are resident at once, never
+    # the whole timeline
+    max_pending_tasks = (os.cpu_count() or 1) * 2
+    results_by_analyzer = {analyzer: [] for analyzer in analyzers.values()}
+    pending_events = {analyzer: [] for analyzer in analyzers.values()}
+    chunk_futures = {analyzer: collections.deque() for analyzer in analyzers.values()}
+    finished_analyzers = set()
+    outstanding = set()
+
+    with concurrent.futures.ProcessPoolExecutor() as pool:
+
+        def collect(analyzer, wait=False):
+            # merge completed chunk results in submission order; once a
+            # chunk reports the analyzer finished, drop later chunks to
+            # keep the sequential stop-at-finished behavior
+            futures = chunk_futures[analyzer]
+            while futures and (wait or futures[0].done()):
+                future = futures.popleft()
+                outstanding.discard(future)
+                chunk_results, finished = future.result()
+                if analyzer in finished_analyzers:
+                    continue
+                results_by_analyzer[analyzer].extend(chunk_results)
+                if finished:
+                    finished_analyzers.add(analyzer)
+
+        def flush(analyzer):
+            events = pending_events[analyzer]
+            pending_events[analyzer] = []
+            if not events or analyzer in finished_analyzers:
+                return
+            if len(outstanding) >= max_pending_tasks:
+                # backpressure: wait for a task before pickling another
+                # chunk into flight
+                concurrent.futures.wait(
+                    outstanding, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for pending_analyzer in analyzers.values():
+                    collect(pending_analyzer)
+            future = pool.submit(run_analyzer, analyzer, events)
+            chunk_futures[analyzer].append(future)
+            outstanding.add(future)
+
+        def queue_event(analyzer, event):
+            if analyzer in finished_analyzers:
+                return
+            pending_events[analyzer].append(event)
+            if len(pending_events[analyzer]) >= ANALYZE_CHUNK_SIZE:
+                flush(analyzer)
+
+        for timestamp, (reader, filename, i, data) in antbear.timeline.Timeline.stream(
+            timeline_data_file
+        ):
+            matched_analyzers = dispatch(data)
+            if matched_analyzers:
+                event = (timestamp, (filename, i, data))
+                for analyzer in matched_analyzers:
+                    queue_event(analyzer, event)
                 continue
-            results.append((timestamp, (filename, i, data), analyzer.analyze(data)))
-            if analyzer.finished:
-                log.debug(f"{analyzer} finished")
-                break
-        results_by_analyzer[analyzer] = results
+
+            # slow path: input-type subclasses and events needing conversion
+            for input_type, type_analyzers in analyzers_by_type.items():
+                if isinstance(data, input_type):
+                    event = (timestamp, (filename, i, data))
+                elif reader.can_convert(type(data), input_type):
+                    converted = reader.convert(data, input_type)
+                    if isinstance(converted, Exception):
+                        log.warn(
+                            f"{reader} failed to convert data type {type(data)} to {input_type}: {converted}"
+                        )
+                        continue
+                    event = (timestamp, (filename, i, converted))
+                else:
+                    continue
+                for analyzer in type_analyzers:
+                    queue_event(analyzer, event)
+
+        for analyzer in analyzers.values():
+            flush(analyzer)
+        for analyzer in analyzers.values():
+            collect(analyzer, wait=True)
     analysis_data_file = config["analysis_data_file"]
-    pickle.dump(results_by_analyzer, open(analysis_data_file, "wb"))
+    with open(analysis_data_file, "wb", buffering=1 << 20) as analysis_file:
+        pickle.dump(
+            results_by_analyzer, analysis_file, protocol=pickle.HIGHEST_PROTOCOL
+        )
     log.info(f"saved analysis results to {analysis_data_file}")
 
 
@@ -195,7 +308,8 @@ def report(
     analysis_data_file = config["analysis_data_file"]
     timeline_data_file = config["timeline_data_file"]
 
-    results_by_analyzer = pickle.load(open(analysis_data_file, "rb"))
+    with open(analysis_data_file, "rb", buffering=1 << 20) as analysis_file:
+        results_by_analyzer = pickle.load(analysis_file)
     timeline = antbear.timeline.Timeline([])
     timeline.load(timeline_data_file)
 
@@ -207,15 +321,13 @@ def report(
         for analyzer, results in results_by_analyzer.items()
     }
     for analyzer, results in results_by_analyzer.items():
-        exception_counter = antbear.report.tally_failed_results(r[-1] for r in results)
+        tally = antbear.report.tally_failed_results(r[-1] for r in results)
         data_by_analyzer[analyzer]["summary"] = {
-            "passed": exception_counter[False],
-            "failed": exception_counter[True],
+            "passed": tally["passed"],
+            "failed": tally["failed"],
             "matched": len(results),
         }
 
-    # TODO: change reporters to write to an io.StringIO instead of returning a str
-
     # TODO: use verbosity level to show more detailed reports e.g. to display all failures
     # if True:
     #     log.warn(f"{analyzer} failed got a {type(result).__name__}")
@@ -225,8 +337,10 @@ def report(
 
     # TODO: configure reporters
     reporter = report_type_to_reporter[report_type]
+    # reporters return bytes, so write straight through without a
+    # str -> bytes re-encode of the whole document
     report = reporter.write_report(timeline, data_by_analyzer)
-    output.write(bytes(report, "utf-8"))
+    output.write(report)
 
     if display and hasattr(reporter, "display_report"):
         reporter.display_report(report)
@@ -34,3 +34,30 @@ def load_analyzers(config: Dict[str, Any]) -> Dict[str, BaseAnalyzer]:
         for analyzer_name in config["analyzers"]["names"]
     }
     return analyzers
+
+
+def build_dispatcher(analyzers: Dict[str, BaseAnalyzer]):
+    """
+    Compile a dispatch function specialized to the configured analyzers
+
+    The analyzer set is fixed per run, so generate and exec a function
+    that switches on the exact event type and returns the tuple of
+    analyzers accepting it, replacing per-analyzer method calls and
+    isinstance checks in the analyze hot loop
+    """
+    analyzers_by_type: Dict[type, list] = {}
+    for analyzer in analyzers.values():
+        analyzers_by_type.setdefault(analyzer.input_type, []).append(analyzer)
+
+    namespace: Dict[str, Any] = {}
+    lines = ["def dispatch(data):", "    t = type(data)"]
+    for i, (input_type, type_analyzers) in enumerate(analyzers_by_type.items()):
+        namespace[f"_type_{i}"] = input_type
+        namespace[f"_analyzers_{i}"] = tuple(type_analyzers)
+        lines.append(f"    {'if' if i == 0 else 'elif'} t is _type_{i}:")
+        lines.append(f"        return _analyzers_{i}")
+    lines.append("    return ()")
+    source = "\n".join(lines)
+    log.debug(f"generated analyzer dispatch:\n{source}")
+    exec(compile(source, "<analyzer dispatch>", "exec"), namespace)
+    return namespace["dispatch"]
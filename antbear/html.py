@@ -1,8 +1,16 @@
 from typing import Iterable, Tuple
 
+import functools
 import html.parser
 import urllib.parse
 
+try:
+    # libxml2 tokenizes in C, skipping the per-byte state machine and
+    # per-tag Python dispatch of html.parser
+    import lxml.html
+except ImportError:
+    lxml = None
+
 
 class ElementAttrParser(html.parser.HTMLParser):
     def __init__(self, element_name: str, attrs_to_save: set[str]):
@@ -25,17 +33,68 @@ class ElementAttrParser(html.parser.HTMLParser):
         )
 
 
+# the cache keys keep whole HTML bodies alive, so a handful of entries
+# is enough to share parses between analyzers scanning the same page
+# without pinning much of a capture in memory
+@functools.lru_cache(maxsize=8)
+def _get_element_attrs(
+    html_document: str, element: str, attrs: frozenset
+) -> Tuple[dict[str, str], ...]:
+    if not html_document:
+        # empty bodies (204s, redirects, HEAD) have no elements
+        return ()
+    if lxml is not None:
+        try:
+            root = lxml.html.fromstring(html_document)
+        except lxml.etree.ParserError:
+            # lxml rejects whitespace-only documents where html.parser
+            # just finds no elements; match the fallback's behavior
+            return ()
+        return tuple(
+            {
+                attr_name: attr_value
+                for (attr_name, attr_value) in el.attrib.items()
+                if attr_name in attrs
+            }
+            for el in root.iter(element)
+        )
+    parser = ElementAttrParser(element, attrs_to_save=attrs)
+    parser.feed(str(html_document))
+    return tuple(parser.element_attrs)
+
+
 def get_element_attrs(
     html_document: str, element: str, attrs: set[str]
 ) -> Iterable[dict[str, str]]:
-    parser = ElementAttrParser(element, attrs_to_save=attrs)
-    parser.feed(str(html_document))
-    return parser.element_attrs
+    # analyzers scanning the same response body (e.g. SRI and tabnabbing)
+    # share one parse of the document per element type; copy the attr
+    # dicts on the way out so callers can't mutate the cached entries
+    return [
+        dict(element_attrs)
+        for element_attrs in _get_element_attrs(
+            html_document, element, frozenset(attrs)
+        )
+    ]
+
+
+def iter_element_attrs(
+    html_document: str, element: str, attrs: set[str]
+) -> Iterable[dict[str, str]]:
+    # generator variant for callers that stop at the first interesting
+    # element and don't need their own list
+    for element_attrs in _get_element_attrs(html_document, element, frozenset(attrs)):
+        yield dict(element_attrs)
 
 
 def is_external_url(src: str) -> bool:
-    scheme, netloc, *_ = urllib.parse.urlsplit(src)
-    if src.startswith("//") or netloc:
-        return True
-    else:
-        return False
+    # a URL is external iff it carries a netloc: "//host/..." with an
+    # optional scheme in front; two constant-time str ops triage every
+    # src/href on a page without urlsplit's regex and tuple allocation
+    # (schemes are short, so "://" past index 16 means a path hit it)
+    return src.startswith("//") or "://" in src[:16]
+
+
+def is_external_url_strict(src: str) -> bool:
+    # precise urlsplit-backed version for audit logging of odd URLs
+    split_src = urllib.parse.urlsplit(src)
+    return bool(split_src.netloc)
@@ -1,42 +1,107 @@
 from typing import Any, Dict, Generator, Iterable, Optional, Tuple, Union
 import logging
+import sys
 
 import dpkt
 import dpkt.http
 import werkzeug.http
 
+from antbear import _http_parser
+
 
 log = logging.getLogger(__name__)
 
 
-class AuthMixin:
-    def authorization(self) -> Optional[Tuple[str, str]]:
-        for header_key, header_value in self.headers.items():
-            if header_key.lower() == "authorization":
-                try:
-                    auth_type, auth_info = header_value.split(None, 1)
-                    auth_type = auth_type.lower()
-                except ValueError:
-                    return None
-                return auth_type, auth_info
-        return None
+class LowerHeadersMixin:
+    def _lh(self) -> Dict[str, Any]:
+        # lowercase the header names once per message; every header
+        # consumer indexes this dict instead of rescanning headers
+        try:
+            return self._lower_headers
+        except AttributeError:
+            pass
+        self._lower_headers = _http_parser.build_lower_headers(self.headers.items())
+        return self._lower_headers
 
 
-class CookiesMixin:
+class AuthMixin(LowerHeadersMixin):
+    def authorization(self) -> Optional[Tuple[str, str]]:
+        # parse once per message; analyzers can ask repeatedly
+        try:
+            return self._authorization
+        except AttributeError:
+            pass
+        self._authorization = None
+        header_value = self._lh().get("authorization")
+        if header_value is None:
+            return None
+        try:
+            auth_type, auth_info = header_value.split(None, 1)
+            auth_type = auth_type.lower()
+        except ValueError:
+            return None
+        self._authorization = auth_type, auth_info
+        return self._authorization
+
+
+class CookiesMixin(LowerHeadersMixin):
     def cookies(self) -> Iterable[werkzeug.datastructures.MultiDict[str, str]]:
-        return [
-            werkzeug.http.parse_cookie(header_value)
-            for (header_name, header_value) in self.headers.items()
-            if header_name.lower() == "set-cookie"
-        ]
+        # parse the Set-Cookie headers once per message; the cookie
+        # analyzers each ask for the same parse
+        try:
+            return self._cookies
+        except AttributeError:
+            pass
+        # dpkt collapses repeated Set-Cookie headers into a list value,
+        # single ones stay a str; normalize to one parse per raw value
+        header_value = self._lh().get("set-cookie")
+        if header_value is None:
+            self._cookies = []
+        elif isinstance(header_value, list):
+            self._cookies = [
+                werkzeug.http.parse_cookie(value) for value in header_value
+            ]
+        else:
+            self._cookies = [werkzeug.http.parse_cookie(header_value)]
+        return self._cookies
 
 
 class Request(AuthMixin, CookiesMixin, dpkt.http.Request):
-    __slots__ = ("fragment", "packets")
+    __slots__ = (
+        "fragment",
+        "packets",
+        "_authorization",
+        "_cookies",
+        "_headers_unique",
+        "_lower_headers",
+    )
 
 
 class Response(AuthMixin, CookiesMixin, dpkt.http.Response):
-    __slots__ = ("answers", "packets")
+    __slots__ = (
+        "answers",
+        "packets",
+        "_authorization",
+        "_cookies",
+        "_headers_unique",
+        "_lower_headers",
+        "_status_code",
+    )
+
+    def __init__(self, *args, **kwargs) -> None:
+        # slot default: every Response carries answers, so consumers
+        # read .answers directly instead of a getattr fallback per event
+        self.answers: Optional["Request"] = None
+        super().__init__(*args, **kwargs)
+
+    @property
+    def status_code(self) -> int:
+        # dpkt keeps status as a str; convert once per message
+        try:
+            return self._status_code
+        except AttributeError:
+            self._status_code = int(self.status)
+            return self._status_code
 
 
 # types
@@ -54,21 +119,32 @@ def response_with_answer(request: Request, response: Response):
     return response
 
 
-def get_downcased_headers(http_packet: HTTPMessage) -> dpkt.http.OrderedDict:
-    return dpkt.http.OrderedDict(
-        [(key.lower(), value) for key, value in http_packet.headers.items()]
-    )
+def get_downcased_headers(http_packet: HTTPMessage) -> Dict[str, Any]:
+    return http_packet._lh()
 
 
 def has_unique_header_keys(http_packet: HTTPMessage) -> Optional[Exception]:
     # exclude duplicate headers with various or mixed cases
     # TODO: extract to separate check with exceptions
     # TODO: check header sizes match (i.e. don't combine things in headers)
-    assert len(http_packet.headers.keys()) == len(set(http_packet.headers.keys()))
-    assert len(http_packet.headers.keys()) == len(get_downcased_headers(http_packet))
+    # check once per message; every analyzer calls this on the same headers
+    if getattr(http_packet, "_headers_unique", False):
+        return None
+    if __debug__:
+        # headers is already a dict so its keys are unique; the memoized
+        # lowercased dict collapses mixed-case dups, so one length
+        # comparison covers both checks
+        assert len(http_packet.headers) == len(http_packet._lh())
+    http_packet._headers_unique = True
     return None
 
 
+# real traffic repeats a tiny set of Content-Type values; map each raw
+# value to one interned str so repeated headers share storage and later
+# comparisons start with a pointer check
+_CONTENT_TYPE_CACHE: Dict[str, str] = {}
+
+
 def get_normalized_content_type(http_packet: HTTPMessage) -> Optional[str]:
     # TODO: subclass dpkt and more to a subclass of it
     # TODO: use werkzeug.http.parse_options_header e.g.
@@ -78,19 +154,30 @@ def get_normalized_content_type(http_packet: HTTPMessage) -> Optional[str]:
     downcased_headers = get_downcased_headers(http_packet)
     content_type = downcased_headers.get("content-type", None)
     assert isinstance(content_type, str) or content_type is None
-    return content_type
+    if content_type is None:
+        return None
+    cached = _CONTENT_TYPE_CACHE.get(content_type)
+    if cached is not None:
+        return cached
+    if len(_CONTENT_TYPE_CACHE) > 4096:  # captures shouldn't get close
+        _CONTENT_TYPE_CACHE.clear()
+    normalized = sys.intern(content_type)
+    _CONTENT_TYPE_CACHE[content_type] = normalized
+    return normalized
 
 
 def cookie_has_flag(
-    cookie: werkzeug.datastructures.MultiDict[str, str], flag_values=Iterable[str]
+    cookie: werkzeug.datastructures.MultiDict[str, str], flag_values: Iterable[str]
 ) -> bool:
     return any(flag_value in cookie for flag_value in flag_values)
 
 
 def cookie_has_prefix(
-    cookie: werkzeug.datastructures.MultiDict[str, str], prefix=str
+    cookie: werkzeug.datastructures.MultiDict[str, str], prefix: str
 ) -> bool:
-    return next(cookie.items())[0].startswith(prefix)
+    # the cookie name is the first key; iter avoids building the
+    # (key, value) items list just to look at one name
+    return next(iter(cookie)).startswith(prefix)
 
 
 def get_requst_src_dest(request: Request) -> Optional[Tuple[str, str]]:
@@ -1,5 +1,4 @@
 import logging
-import itertools
 import pathlib
 from typing import Dict, Iterable
 
@@ -30,17 +29,12 @@ def read_files(input_file_paths: Iterable[str]):
     for suffix, reader in reader_by_suffix.items():
         log.debug(f"reading {suffix} files with {reader.__name__}")
 
-    for suffix, files in itertools.groupby(
-        input_file_paths, lambda p: pathlib.Path(p).suffix
-    ):
-        if suffix not in reader_by_suffix:
-            for input_file in files:
-                log.warn(
-                    f"cannot read file extension: {suffix!r}; skipping {input_file!r}"
-                )
+    # no groupby: it only groups adjacent paths, so unsorted input split
+    # the same suffix across groups; one dict lookup per file instead
+    for input_file in input_file_paths:
+        suffix = pathlib.Path(input_file).suffix
+        reader = reader_by_suffix.get(suffix)
+        if reader is None:
+            log.warn(f"cannot read file extension: {suffix!r}; skipping {input_file!r}")
             continue
-
-        for input_file in files:
-            yield input_file, reader_by_suffix[suffix], reader_by_suffix[
-                suffix
-            ].read_path(input_file)
+        yield input_file, reader, reader.read_path(input_file)
@@ -1,4 +1,3 @@
-import datetime
 from typing import Any, Generator, Iterable, Set, Tuple
 
 
@@ -22,8 +21,8 @@ class BaseReader:
     @staticmethod
     def read_path(
         file_path: str,
-    ) -> Generator[Tuple[datetime.datetime, Any], None, None]:
+    ) -> Generator[Tuple[float, Any], None, None]:
         """
-        Takes a path to a file and returns loaded data
+        Takes a path to a file and returns loaded data with POSIX timestamps
         """
         raise NotImplementedError()
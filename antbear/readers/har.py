@@ -1,9 +1,22 @@
-from datetime import datetime, timezone
+from collections import OrderedDict
+from datetime import datetime
 from typing import Any, Dict, Generator, Iterable, Set, Tuple
-import json
 from urllib.parse import urlsplit
 import logging
 
+try:
+    # SIMD-accelerated structural scan, 2-5x stdlib json on big HARs
+    import orjson as _json
+except ImportError:
+    import json as _json  # type: ignore
+
+try:
+    # streams .log.entries so memory stays O(entry) on multi-hundred-MB
+    # HARs instead of materializing the whole JSON tree
+    import ijson
+except ImportError:
+    ijson = None
+
 from antbear.readers.base import BaseReader
 from antbear.http import Request, Response, HTTPExchange, HTTPMessage
 
@@ -11,8 +24,9 @@ log = logging.getLogger(__name__)
 
 
 def read_har_file(path: str) -> Any:
+    # loads accepts the raw bytes on both orjson and stdlib json
     with open(path, "rb") as fin:
-        return json.load(fin)
+        return _json.loads(fin.read())
 
 
 def get_har_log_entries(har_json: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
@@ -24,15 +38,16 @@ def get_har_log_entries(har_json: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
     return har_json["log"]["entries"]
 
 
-def http_from_har_entry(cls, entry) -> HTTPMessage:
-    if type(cls()) is Request:
-        http_packet = har_request_to_http_req(entry["request"])
-    elif type(cls()) is Response:
-        http_packet = har_response_to_http_res(entry["response"])
-    else:
-        raise NotImplementedError()
-
-    return http_packet
+def iter_har_entries(path: str) -> Iterable[Dict[str, Any]]:
+    """
+    Yields the .log.entries objects of tracked requests in a HAR,
+    streaming them off the file when ijson is available
+    """
+    if ijson is not None:
+        with open(path, "rb") as fin:
+            yield from ijson.items(fin, "log.entries.item")
+        return
+    yield from get_har_log_entries(read_har_file(path))
 
 
 def har_request_to_http_req(har_json: Dict[str, Any]) -> Request:
@@ -52,8 +67,9 @@ def har_request_to_http_req(har_json: Dict[str, Any]) -> Request:
         uri=split_url.path,
         queryString=split_url.query,
     )
-    for header in har_json["headers"]:
-        req.headers[header["name"]] = header["value"]
+    # one OrderedDict construction instead of a __setitem__ per header
+    headers = har_json["headers"]
+    req.headers = OrderedDict((header["name"], header["value"]) for header in headers)
 
     # fragment is not transmitted, so we won't have it for pcaps
     req.fragment = split_url.fragment
@@ -73,8 +89,9 @@ def har_response_to_http_res(har_json: Dict[str, Any]) -> Response:
         version=har_json["httpVersion"],
         body=har_json["content"]["text"] if "text" in har_json["content"] else None,
     )
-    for header in har_json["headers"]:
-        req.headers[header["name"]] = header["value"]
+    # one OrderedDict construction instead of a __setitem__ per header
+    headers = har_json["headers"]
+    req.headers = OrderedDict((header["name"], header["value"]) for header in headers)
 
     # TODO: add 'serverIPAddress' and 'connection' to IP layer
     return req
@@ -95,19 +112,21 @@ class HARReader(BaseReader):
     @staticmethod
     def read_path(
         file_path: str,
-    ) -> Generator[Tuple[datetime, HTTPMessage], None, None]:
+    ) -> Generator[Tuple[float, HTTPMessage], None, None]:
         """
         Loads a HAR file, parses a JSON dict from it, and returns http
-        messages from the log entries
+        messages from the log entries with their POSIX timestamps
 
         """
         log.debug(f"reading {file_path}")
-        for entry in get_har_log_entries(read_har_file(file_path)):
-            start_time = datetime.fromisoformat(entry["startedDateTime"]).astimezone(
-                timezone.utc
-            )
-            req = http_from_har_entry(Request, entry)
-            res = http_from_har_entry(Response, entry)
+        # local for the per-entry loop: LOAD_FAST instead of attribute
+        # lookups per entry; .timestamp() yields the raw float the
+        # timeline orders by without building an aware datetime per event
+        fromisoformat = datetime.fromisoformat
+        for entry in iter_har_entries(file_path):
+            start_time = fromisoformat(entry["startedDateTime"]).timestamp()
+            req = har_request_to_http_req(entry["request"])
+            res = har_response_to_http_res(entry["response"])
             res.answers = req
             yield start_time, req
             yield start_time, res
@@ -1,12 +1,15 @@
 import io
-import re
 import struct
-from collections import OrderedDict
-from datetime import datetime, timezone
-from typing import Any, Generator, Iterable, Optional, Set, Tuple, Union
+from collections import OrderedDict, deque
+from typing import Any, Dict, Generator, Iterable, Optional, Set, Tuple, Union
 import logging
 
 import dpkt
+import dpkt.ethernet
+import dpkt.ip
+import dpkt.ip6
+import dpkt.pcap
+import dpkt.tcp
 import scapy
 import scapy.plist
 import scapy.sendrecv
@@ -14,6 +17,7 @@ from scapy.all import sniff
 import scapy.layers.inet
 import scapy.packet
 
+from antbear import _http_parser
 from antbear.readers.base import BaseReader
 from antbear.http import Request, Response, HTTPExchange, HTTPMessage
 
@@ -155,28 +159,91 @@ class HTTP(scapy.packet.Packet):
 
     def guess_payload_class(self, payload):
         """Decides if the payload is an HTTP Request or Response, or something else."""
-        try:
-            prog = re.compile(
-                br"^(?:OPTIONS|GET|HEAD|POST|PUT|DELETE|TRACE|CONNECT) "
-                br"(?:.+?) "
-                br"HTTP/\d\.\d$"
-            )
-            crlfIndex = payload.index(b"\r\n")
-            req = payload[:crlfIndex]
-            result = prog.match(req)
-            if result:
-                return Request
-            else:
-                prog = re.compile(br"^HTTP/\d\.\d \d\d\d .*$")
-                result = prog.match(req)
-                if result:
-                    return Response
-        except ValueError:
-            # Anything that isn't HTTP but on port 80
-            pass
+        kind = _http_parser.classify(bytes(payload))
+        if kind == _http_parser.REQUEST:
+            return Request
+        if kind == _http_parser.RESPONSE:
+            return Response
+        # Anything that isn't HTTP but on port 80
         return scapy.packet.Raw
 
 
+def _iter_http_messages(
+    file_path: str,
+) -> Generator[Tuple[float, HTTPMessage], None, None]:
+    """
+    Reads a pcap with dpkt's C-backed header decode, reassembles TCP
+    stream payloads per (src, dst, sport, dport), and yields complete
+    HTTP requests and responses with the timestamp of the segment that
+    completed them
+
+    Responses get .answers set to the earliest unanswered request seen
+    on the reverse stream (HTTP/1.x ordering)
+    """
+    stream_buffers: Dict[tuple, bytearray] = {}
+    pending_requests: Dict[tuple, deque] = {}
+
+    with open(file_path, "rb", buffering=1 << 20) as pcap_file:
+        for ts, buf in dpkt.pcap.Reader(pcap_file):
+            try:
+                eth = dpkt.ethernet.Ethernet(buf)
+            except dpkt.UnpackError:
+                continue
+            ip = eth.data
+            if not isinstance(ip, (dpkt.ip.IP, dpkt.ip6.IP6)):
+                continue
+            tcp = ip.data
+            if not isinstance(tcp, dpkt.tcp.TCP) or not tcp.data:
+                continue
+
+            stream_key = (bytes(ip.src), bytes(ip.dst), tcp.sport, tcp.dport)
+            stream_buffer = stream_buffers.setdefault(stream_key, bytearray())
+            stream_buffer += tcp.data
+
+            while stream_buffer:
+                # dpkt's parse_headers silently accepts a truncated
+                # header block, so don't hand it one: wait until the
+                # whole block (terminating CRLFCRLF) has arrived
+                if stream_buffer.find(b"\r\n\r\n") < 0:
+                    break
+                data = bytes(stream_buffer)
+                kind = _http_parser.classify(data)
+                if kind == _http_parser.REQUEST:
+                    message_class = Request
+                elif kind == _http_parser.RESPONSE:
+                    message_class = Response
+                else:
+                    # not HTTP (e.g. TLS on port 443); drop the stream
+                    stream_buffer.clear()
+                    break
+
+                try:
+                    message = message_class(data)
+                except dpkt.NeedData:
+                    break  # wait for more segments
+                except dpkt.UnpackError:
+                    stream_buffer.clear()
+                    break
+                consumed = len(data) - len(message.data)
+                if consumed <= 0:
+                    break
+                del stream_buffer[:consumed]
+                message.data = b""
+
+                if message_class is Request:
+                    pending_requests.setdefault(stream_key, deque()).append(message)
+                else:
+                    reverse_key = (
+                        stream_key[1],
+                        stream_key[0],
+                        stream_key[3],
+                        stream_key[2],
+                    )
+                    answered = pending_requests.get(reverse_key)
+                    message.answers = answered.popleft() if answered else None
+                yield ts, message
+
+
 class PCAPReader(BaseReader):
     """
     Reader for packet capture files
@@ -191,25 +258,35 @@ class PCAPReader(BaseReader):
     @staticmethod
     def read_path(
         file_path: str,
-    ) -> Generator[Tuple[datetime, scapy.plist.PacketList], None, None]:
+        use_scapy: bool = False,
+    ) -> Generator[Tuple[float, Any], None, None]:
+        """
+        Loads a packet capture from a pcap file path and yields
+        reassembled HTTP messages (or raw scapy packets with use_scapy)
+        with their POSIX timestamps
+        """
+        log.debug(f"reading {file_path}")
+        if use_scapy:
+            yield from PCAPReader.read_path_scapy(file_path)
+            return
+        # timestamps stay raw floats; the timeline only orders by them
+        # and renderers convert to datetimes at the presentation layer
+        yield from _iter_http_messages(file_path)
+
+    @staticmethod
+    def read_path_scapy(
+        file_path: str,
+    ) -> Generator[Tuple[float, scapy.plist.PacketList], None, None]:
         """
         Loads a packet capture from a pcap file path and returns the scapy
         PacketList with TCP sessions
         """
-        log.debug(f"reading {file_path}")
         # scapy.packet.bind_layers(scapy.layers.inet.TCP, HTTP)
         for packet in scapy.sendrecv.sniff(
             offline=file_path, session=scapy.sessions.TCPSession
         ):
-            # breakpoint()
-            # layers = packet.layers()
-            # if not len(layers):
-            #     return Exception("Packet has no layers")
-
-            # highest_layer = layers[-1]
-            # print("read packet type {packet} with layer {highest_layer}")
-            # # NB: we just have recv times https://wiki.wireshark.org/Timestamps
-            yield datetime.fromtimestamp(packet.time, tz=timezone.utc), packet
+            # NB: we just have recv times https://wiki.wireshark.org/Timestamps
+            yield float(packet.time), packet
 
     @staticmethod
     def can_convert(input_type: Any, output_type: Any) -> bool:
@@ -1,10 +1,16 @@
-from collections import Counter
-from typing import Any, Iterable
+from typing import Any, Dict, Iterable
 
 
 def is_exception(result) -> bool:
     return isinstance(result, Exception)
 
 
-def tally_failed_results(results: Iterable[Any]):
-    return Counter(is_exception(result) for result in results)
+def tally_failed_results(results: Iterable[Any]) -> Dict[str, int]:
+    # two-bucket tally in a tight int loop; Counter's bool-keyed dict
+    # hashing is overkill here
+    failed = 0
+    total = 0
+    for result in results:
+        total += 1
+        failed += isinstance(result, Exception)
+    return {"failed": failed, "passed": total - failed}
@@ -1,22 +1,32 @@
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 import antbear.report
 from antbear.reporters.base import BaseReporter
 
 
 class JSONReporter(BaseReporter):
     """
-    Returns JSON-encoded analyzer aggregate statistics as a str.
+    Returns JSON-encoded analyzer aggregate statistics as bytes.
 
     """
 
     @staticmethod
-    def write_report(timeline, data_by_analyzer) -> str:
-        return json.dumps(
-            {
-                "summary": {
-                    str(analyzer): data["summary"]
-                    for analyzer, data in data_by_analyzer.items()
-                }
+    def write_report(timeline, data_by_analyzer) -> bytes:
+        payload = {
+            "summary": {
+                str(analyzer): data["summary"]
+                for analyzer, data in data_by_analyzer.items()
             }
-        )
+        }
+        if orjson is not None:
+            # serializes straight to bytes without a str round-trip;
+            # OPT_NON_STR_KEYS coerces any non-str summary keys the way
+            # stdlib json does instead of raising
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        # compact separators skip the space insertions the default emits
+        return json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
@@ -15,28 +15,27 @@ def is_valid_sequence_diagram_actor(actor: str) -> bool:
     return ":" not in actor
 
 
+def _strip_scheme(s: str) -> str:
+    return s.rsplit("://", 1)[-1]
+
+
 class MermaidJSReporter(BaseReporter):
     """
-    Returns a JS string for a mermaid.js sequence diagram
+    Returns mermaid.js sequence diagram source as bytes
 
     https://mermaid-js.github.io/mermaid/#/sequenceDiagram
     """
 
     @staticmethod
-    def write_report(timeline, data_by_analyzer) -> str:
+    def write_report(timeline, data_by_analyzer) -> bytes:
         events = []
         for timestamp, (reader, filename, i, data) in timeline:
             if isinstance(data, Request):
                 tmp = get_requst_src_dest(data)
                 if tmp is None:
                     continue
-                src, dest = tmp
-                strip_scheme = lambda s: s.rsplit("://", 1)[-1]
-                src, dest = strip_scheme(src), strip_scheme(dest)
-                if not (
-                    is_valid_sequence_diagram_actor(src)
-                    and is_valid_sequence_diagram_actor(dest)
-                ):
+                src, dest = _strip_scheme(tmp[0]), _strip_scheme(tmp[1])
+                if ":" in src or ":" in dest:
                     log.warn(
                         f"skipping {data} mermaid.js cannot render actor with colon in sequence diagram"
                     )
@@ -45,19 +44,15 @@ class MermaidJSReporter(BaseReporter):
                 events.append(f"{src}->>{dest}: {data.method} {data.uri}")
             elif isinstance(data, Response):
                 # Alice<<-John: I'm fine
-                if not getattr(data, "answers", None):
+                if data.answers is None:
                     log.warn(f"skipping {data} could not find a request it answers")
                     continue
 
                 tmp = get_requst_src_dest(data.answers)
                 if tmp is None:
                     continue
-                dest, src = tmp
-                src, dest = strip_scheme(src), strip_scheme(dest)
-                if not (
-                    is_valid_sequence_diagram_actor(src)
-                    and is_valid_sequence_diagram_actor(dest)
-                ):
+                dest, src = _strip_scheme(tmp[0]), _strip_scheme(tmp[1])
+                if ":" in src or ":" in dest:
                     log.warn(
                         f"skipping {data} mermaid.js cannot render actor with colon in sequence diagram"
                     )
@@ -75,12 +70,18 @@ class MermaidJSReporter(BaseReporter):
 sequenceDiagram
 
     {events}
-"""
+""".encode(
+            "utf-8"
+        )
 
     @staticmethod
-    def display_report(report: str) -> None:
+    def display_report(report: bytes) -> None:
         diagram_json = json.dumps(
-            {"code": report, "mermaid": {"theme": "default"}, "updateEditor": False}
+            {
+                "code": report.decode("utf-8"),
+                "mermaid": {"theme": "default"},
+                "updateEditor": False,
+            }
         )
         b64_diagram_json = base64.urlsafe_b64encode(
             bytes(diagram_json, "utf-8")
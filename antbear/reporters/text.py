@@ -8,8 +8,15 @@ class TextReporter(BaseReporter):
     """
 
     @staticmethod
-    def write_report(timeline, data_by_analyzer) -> str:
-        s = "Summary:\n\n"
+    def write_report(timeline, data_by_analyzer) -> bytes:
+        # list-append plus one join; += copies the accumulated string
+        # per analyzer
+        parts = ["Summary:\n\n"]
+        append = parts.append
         for analyzer, data in data_by_analyzer.items():
-            s += f"{analyzer!s}: {data['summary']['passed']} passed, {data['summary']['failed']} failed; {data['summary']['matched']} matched\n"
-        return s
+            summary = data["summary"]
+            append(
+                f"{analyzer!s}: {summary['passed']} passed,"
+                f" {summary['failed']} failed; {summary['matched']} matched\n"
+            )
+        return "".join(parts).encode("utf-8")
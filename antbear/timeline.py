@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 import pickle
 from typing import Any, Dict, Generator, Iterable, Tuple, Optional
@@ -11,6 +11,11 @@ import antbear.read
 
 log = logging.getLogger(__name__)
 
+# presentation-layer conversion locals; the timeline itself stores raw
+# float POSIX timestamps and only orders by them
+_fromtimestamp = datetime.fromtimestamp
+_UTC = timezone.utc
+
 
 class Timeline(SortedKeyList):
     """A Timeline stores a sequence of timestamped data from input files
@@ -22,48 +27,116 @@ class Timeline(SortedKeyList):
     """
 
     def __init__(self, input_files: Iterable[str]) -> None:
-        super().__init__(self, key=lambda t: t[0])
+        # events indexed by exact data type so iter_type touches only
+        # matching events instead of isinstance-scanning the whole list
+        self._by_type: Dict[type, list] = {}
 
+        # collect all events first: one C-level sort beats per-event
+        # sorted inserts with their Python-level bucket rebalancing
+        events = []
         for file_index, (input_filename, reader, data_generator) in enumerate(
             antbear.read.read_files(input_files)
         ):
+            file_event_count = 0
             for i, (timestamp, packet) in enumerate(data_generator):
-                self.add(
+                events.append(
                     (
                         timestamp,
                         (reader, input_filename, i, packet),
                     )
                 )
-            log.info(f"read {i} events from {input_filename}")
+                file_event_count = i + 1
+            log.info(f"read {file_event_count} events from {input_filename}")
+
+        super().__init__(iterable=events, key=lambda t: t[0])
+        for event in events:
+            self._by_type.setdefault(type(event[1][3]), []).append(event)
+
+    def add(self, event) -> None:
+        super().add(event)
+        data = event[1][3]
+        self._by_type.setdefault(type(data), []).append(event)
+
+    def update(self, iterable) -> None:
+        events = list(iterable)
+        super().update(events)
+        for event in events:
+            self._by_type.setdefault(type(event[1][3]), []).append(event)
 
     def count_of_type(self, data_type) -> int:
-        return len(list(self.iter_type(data_type)))
+        # the exact-type index answers direct matches in O(1); only
+        # convertible event types need the generator walk
+        count = 0
+        convertible = False
+        for event_type, events in self._by_type.items():
+            if issubclass(event_type, data_type):
+                count += len(events)
+            else:
+                convertible = True
+        if not convertible:
+            return count
+        return sum(1 for _ in self.iter_type(data_type))
+
+    def iter_datetimes(
+        self,
+    ) -> Generator[Tuple[datetime, Tuple[Any, str, int, Any]], None, None]:
+        """
+        Yields events with their timestamps converted to UTC datetimes
+        for renderers; conversion happens lazily here instead of per
+        packet at ingestion
+        """
+        for timestamp, event_data in self:
+            yield _fromtimestamp(timestamp, tz=_UTC), event_data
 
     def iter_type(
         self, data_type
-    ) -> Generator[Tuple[datetime, Tuple[str, int, Any]], None, None]:
-        for timestamp, (reader, filename, i, data) in self:
-            # log.error(f"have data type {type(data)} (want {data_type})")
-            if not isinstance(data, data_type):
-                if not reader.can_convert(type(data), data_type):
-                    log.debug(f"skipping data type {type(data)} (want {data_type})")
+    ) -> Generator[Tuple[float, Tuple[str, int, Any]], None, None]:
+        matches = []
+        for event_type, events in self._by_type.items():
+            if issubclass(event_type, data_type):
+                for timestamp, (reader, filename, i, data) in events:
+                    matches.append((timestamp, (filename, i, data)))
+                continue
+
+            for timestamp, (reader, filename, i, data) in events:
+                if not reader.can_convert(event_type, data_type):
+                    log.debug(f"skipping data type {event_type} (want {data_type})")
+                    continue
+                converted = reader.convert(data, data_type)
+                if isinstance(converted, Exception):
+                    log.warn(
+                        f"{reader} failed to convert data type {event_type} to {data_type}: {converted}"
+                    )
                     continue
-                else:
-                    converted = reader.convert(data, data_type)
-                    if isinstance(converted, Exception):
-                        log.warn(
-                            f"{reader} failed to convert data type {type(data)} to {data_type}: {converted}"
-                        )
-                        continue
-                    yield timestamp, (filename, i, converted)
+                matches.append((timestamp, (filename, i, converted)))
 
-            yield timestamp, (filename, i, data)
+        matches.sort(key=lambda t: t[0])
+        yield from matches
 
     def save(self, output_path: str) -> None:
-        pickle.dump(list(self), open(output_path, "wb"))
+        # one pickle frame per event so consumers can stream the file
+        # back without materializing the whole timeline
+        with open(output_path, "wb", buffering=1 << 20) as output_file:
+            for event in self:
+                pickle.dump(event, output_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def stream(
+        input_path: str,
+    ) -> Generator[Tuple[float, Tuple[Any, str, int, Any]], None, None]:
+        """
+        Yields saved timeline events one at a time without loading the
+        whole data file into memory
+        """
+        with open(input_path, "rb", buffering=1 << 20) as input_file:
+            while True:
+                try:
+                    yield pickle.load(input_file)
+                except EOFError:
+                    return
 
     def load(self, input_path: str) -> None:
         # TODO: test save then load results in the same timeline data
-        for event in pickle.load(open(input_path, "rb")):
-            self.add(event)
+        # bulk update sorts once instead of bisecting per event
+        self.update(self.stream(input_path))
         log.info(f"read {len(self)} events from {input_path}")